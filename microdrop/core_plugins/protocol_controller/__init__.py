@@ -830,13 +830,14 @@ version of the software.'''.strip(), filename, why.future_version,
         '''
         .. versionadded:: 2.35.0
         '''
-        app = get_app()
+        protocol = get_app().protocol
+        steps = protocol.steps
         active_step_number = self.protocol_state['step_number']
-        if active_step_number == len(app.protocol.steps) - 1:
-            current_step = app.protocol.steps[active_step_number]
+        if active_step_number == len(steps) - 1:
+            current_step = steps[active_step_number]
             # Last step is currently selected.  Append new step to end.
-            app.protocol.insert_step(step_number=active_step_number,
-                                     value=current_step.copy(), notify=False)
+            protocol.insert_step(step_number=active_step_number,
+                                 value=current_step.copy(), notify=False)
             self.next_step()
             emit_signal('on_step_inserted', args=[active_step_number + 1])
         else:
@@ -862,7 +863,11 @@ version of the software.'''.strip(), filename, why.future_version,
         '''
         .. versionadded:: 2.35.0
         '''
-        self.goto_step(len(get_app().protocol.steps) - 1)
+        last_step_number = len(get_app().protocol.steps) - 1
+        if self.protocol_state['step_number'] == last_step_number:
+            # Last step is already active; skip redundant `on_step_swapped`.
+            return
+        self.goto_step(last_step_number)
 
     def goto_step(self, step_number):
         '''
@@ -1,6 +1,5 @@
 from collections import OrderedDict
-from copy import deepcopy
-from functools import reduce
+import functools as ft
 try:
     import pickle as pickle
 except ImportError:
@@ -11,18 +10,47 @@ import os
 import time
 import uuid
 
-from microdrop_utility import is_int, Version, FutureVersionError
+from microdrop_utility import Version, FutureVersionError
 from path_helpers import path
-import arrow
 import pandas as pd
 import yaml
 
 from logging_helpers import _L  #: .. versionadded:: 2.20
 
+from .serialization import (YamlLoader as _YLoader, YamlDumper as _YDumper,
+                            load_pickle_or_yaml)
+
 
 logger = logging.getLogger(__name__)
 
 
+def _dir_has_entries(dir_path):
+    '''
+    Returns
+    -------
+    bool
+        ``True`` if directory contains at least one file/directory.
+    '''
+    with os.scandir(dir_path) as entries:
+        return next(entries, None) is not None
+
+
+def _utc_naive(timestamp):
+    '''
+    Parameters
+    ----------
+    timestamp : float
+        POSIX timestamp (e.g., as returned by :func:`time.time`).
+
+    Returns
+    -------
+    datetime.datetime
+        Naive :class:`datetime.datetime` in UTC.
+    '''
+    return (dt.datetime.fromtimestamp(float(timestamp), dt.timezone.utc)
+            .replace(tzinfo=None))
+
+
 def log_data_to_frame(log_data_i):
     '''
     Parameters
@@ -47,36 +75,70 @@ def log_data_to_frame(log_data_i):
             compatible types.
     '''
     def log_frame_experiment_info(df_log):
-        experiment_info = df_log['core'].iloc[0].copy()
-        experiment_info.update(df_log['core'].iloc[-1])
+        df_core = df_log['core']
+        # Values from last row take precedence, with missing values filled
+        # from first row.
+        experiment_info = df_core.iloc[-1].combine_first(df_core.iloc[0])
 
-        start_time = arrow.get(experiment_info['start time']).naive
+        start_time = _utc_naive(experiment_info['start time'])
         experiment_info['utc_start_time'] = start_time.isoformat()
-        for k in ('step', 'start time', 'time', 'attempt', 'utc_timestamp'):
-            if k in experiment_info.index:
-                del experiment_info[k]
+        experiment_info = experiment_info.drop(labels=['step', 'start time',
+                                                       'time', 'attempt',
+                                                       'utc_timestamp'],
+                                               errors='ignore')
         return experiment_info.dropna()
 
-    plugin_names_i = sorted(reduce(lambda a, b: a.union(list(b.keys())),
-                                   log_data_i.data, set()))
-    frames_i = OrderedDict()
+    plugin_names_i = set()
+    for step_data_ij in log_data_i.data:
+        plugin_names_i.update(step_data_ij)
+    plugin_names_i = sorted(plugin_names_i)
+    n_steps = len(log_data_i.data)
+
+    # Unpickle each plugin blob exactly once, collecting records (and the
+    # corresponding step index) for each plugin in a single pass over the log.
+    rows_by_plugin = OrderedDict((plugin_name_ij, ([], []))
+                                 for plugin_name_ij in plugin_names_i)
+    failed_plugins = set()
+    _loads = pickle.loads
+    for step_ij, step_data_ij in enumerate(log_data_i.data):
+        for plugin_name_ij, blob_ij in step_data_ij.items():
+            if plugin_name_ij in failed_plugins:
+                continue
+            try:
+                record_ij = _loads(blob_ij) if blob_ij else {}
+            except Exception as exception:
+                print((plugin_name_ij, exception))
+                failed_plugins.add(plugin_name_ij)
+                continue
+            index_ij, records_ij = rows_by_plugin[plugin_name_ij]
+            index_ij.append(step_ij)
+            records_ij.append(record_ij)
 
-    for plugin_name_ij in plugin_names_i:
+    frames_i = OrderedDict()
+    for plugin_name_ij, (index_ij, records_ij) in rows_by_plugin.items():
+        if plugin_name_ij in failed_plugins:
+            continue
         try:
-            frame_ij = pd.DataFrame([pickle.loads(v)
-                                        if v else {} for v in [s.get(plugin_name_ij)
-                                        for s in log_data_i.data]])
+            frame_ij = (pd.DataFrame(records_ij, index=index_ij)
+                        .reindex(range(n_steps)))
         except Exception as exception:
             print((plugin_name_ij, exception))
         else:
             frames_i[plugin_name_ij] = frame_ij
-    df_log_i = pd.concat(list(frames_i.values()), axis=1, keys=list(frames_i.keys()))
 
-    start_time_i = arrow.get(df_log_i.iloc[0][('core', 'start time')]).naive
-    df_log_i[('core', 'utc_timestamp')] = \
-        (start_time_i + df_log_i[('core', 'time')]
-         .map(lambda s: dt.timedelta(seconds=s) if s == s else None))
-    df_log_i.sort_index(axis=1, inplace=True)
+    # Add UTC timestamp column to `core` frame *before* concatenating, so that
+    # the columns of each (narrow) plugin frame may be sorted independently.
+    # Plugin names are already sorted, so there is no need to sort the
+    # (potentially wide) concatenated frame.
+    df_core_i = frames_i['core']
+    start_time_i = _utc_naive(df_core_i.iloc[0]['start time'])
+    # Missing (i.e., `NaN`) times are propagated as `NaT`.
+    df_core_i['utc_timestamp'] = \
+        (pd.Timestamp(start_time_i) +
+         pd.to_timedelta(df_core_i['time'].astype('float64'), unit='s'))
+    df_log_i = pd.concat([frame_ij.sort_index(axis=1)
+                          for frame_ij in frames_i.values()], axis=1,
+                         keys=list(frames_i.keys()))
     experiment_info = log_frame_experiment_info(df_log_i)
     experiment_info['uuid'] = log_data_i.uuid
     df_log_i.dropna(subset=[('core', 'step'), ('core', 'attempt')],
@@ -94,26 +156,35 @@ class ExperimentLog():
         self.uuid = str(uuid.uuid4())
         self._get_next_id()
         self.metadata = {}  # Meta data, keyed by plugin name.
+        self._frame_cache = None
         _L().info('new log with id=%s and uuid=%s', self.experiment_id,
                   self.uuid)
 
+    def __getstate__(self):
+        # Do not serialize cached `to_frame()` result.
+        state = self.__dict__.copy()
+        state.pop('_frame_cache', None)
+        return state
+
     def _get_next_id(self):
         if self.directory is None:
             self.experiment_id = None
             return
         if os.path.isdir(self.directory) is False:
             os.makedirs(self.directory)
-        logs = path(self.directory).listdir()
-        self.experiment_id = 0
-        for d in logs:
-            if is_int(d.name):
-                i = int(d.name)
-                if i >= self.experiment_id:
-                    self.experiment_id = i
-                    # increment the experiment_id if the current directory is
-                    # not empty
-                    if len(d.listdir()):
-                        self.experiment_id += 1
+        max_id = -1
+        max_id_nonempty = False
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.isdecimal() and entry.is_dir():
+                    i = int(entry.name)
+                    if i > max_id:
+                        max_id = i
+                        max_id_nonempty = _dir_has_entries(entry.path)
+        self.experiment_id = max(max_id, 0)
+        # increment the experiment_id if the current directory is not empty
+        if max_id_nonempty:
+            self.experiment_id += 1
         log_path = self.get_log_path()
         if not log_path.isdir():
             log_path.makedirs_p()
@@ -134,32 +205,29 @@ class ExperimentLog():
             logger.debug('version > class_version')
             raise FutureVersionError
         if version < Version(0, 1, 0):
-            new_data = []
             plugin_name = None
             for step_data in self.data:
-                if "control board hardware version" in list(step_data.keys()):
+                if "control board hardware version" in step_data:
                     plugin_name = "wheelerlab.dmf_control_board_" + \
                         step_data["control board hardware version"]
-            for i in range(len(self.data)):
-                new_data.append({})
-                for k, v in list(self.data[i].items()):
+            # Split each step into plugin dictionaries and serialize them to
+            # yaml strings in a single pass.
+            new_data = []
+            for step_data in self.data:
+                new_step = {}
+                for k, v in step_data.items():
                     if plugin_name and k in ("FeedbackResults",
                                              "SweepFrequencyResults",
                                              "SweepVoltageResults"):
                         try:
-                            new_data[i][plugin_name] = {k: pickle.loads(v)}
+                            new_step[plugin_name] = {k: pickle.loads(v)}
                         except Exception as e:
                             logger.error("Couldn't load experiment log data "
                                          "for plugin: %s. %s.", plugin_name, e)
                     else:
-                        if "core" not in new_data[i]:
-                            new_data[i]["core"] = {}
-                        new_data[i]["core"][k] = v
-
-            # serialize objects to yaml strings
-            for i in range(len(self.data)):
-                for plugin_name, plugin_data in list(new_data[i].items()):
-                    new_data[i][plugin_name] = yaml.dump(plugin_data)
+                        new_step.setdefault("core", {})[k] = v
+                new_data.append({name: yaml.dump(data, Dumper=_YDumper)
+                                 for name, data in new_step.items()})
             self.data = new_data
             self.version = str(Version(0, 1, 0))
         if version < Version(0, 2, 0):
@@ -184,21 +252,27 @@ class ExperimentLog():
         """
         logger = _L()  # use logger with method context
         logger.info("Loading Experiment log from %s", filename)
-        out = None
         start_time = time.time()
-        with open(filename, 'rb') as f:
-            try:
-                out = pickle.load(f)
-                logger.debug("Loaded object from pickle.")
-            except Exception as e:
-                logger.debug("Not a valid pickle file. %s." % e)
-        if out is None:
-            with open(filename, 'rb') as f:
-                try:
-                    out = yaml.load(f)
-                    logger.debug("Loaded object from YAML file.")
-                except Exception as e:
-                    logger.debug("Not a valid YAML file. %s." % e)
+        # enable loading of old experiment logs where the experiment log
+        # module was imported as a top-level module
+        class _Unpickler(pickle.Unpickler):
+            def find_class(self, module, name):
+                if module == 'experiment_log':
+                    module = __name__
+                return super(_Unpickler, self).find_class(module, name)
+
+        def pickle_load(f):
+            return _Unpickler(f, encoding='latin1').load()
+
+        def yaml_load(f):
+            value = f.read().replace(b'!!python/object:experiment_log.',
+                                     ('!!python/object:%s.' %
+                                      __name__).encode())
+            return yaml.load(value, Loader=_YLoader)
+
+        with open(filename, 'rb', buffering=1 << 20) as f:
+            out = load_pickle_or_yaml(f, pickle_load=pickle_load,
+                                      yaml_load=yaml_load)
         if out is None:
             raise TypeError
         out.filename = filename
@@ -209,18 +283,26 @@ class ExperimentLog():
             out.version = str(Version(0))
         out._upgrade()
         # load objects from serialized strings
-        for i in range(len(out.data)):
-            for plugin_name, plugin_data in list(out.data[i].items()):
-                try:
-                    out.data[i][plugin_name] = pickle.loads(plugin_data)
-                except Exception as e:
-                    logger.debug("Not a valid pickle string ("
-                                 "plugin: %s). %s." % (plugin_name, e))
+        for i, step_data in enumerate(out.data):
+            decoded = {}
+            for plugin_name, plugin_data in step_data.items():
+                if not isinstance(plugin_data, str):
+                    # Pickled data is stored as bytes.  Text can only be YAML,
+                    # so skip the pickle attempt for it entirely.
                     try:
-                        out.data[i][plugin_name] = yaml.load(plugin_data)
+                        decoded[plugin_name] = pickle.loads(plugin_data)
+                        continue
                     except Exception as e:
-                        logger.error("Couldn't load experiment log data for "
-                                     "plugin: %s. %s." % (plugin_name, e))
+                        logger.debug("Not a valid pickle string ("
+                                     "plugin: %s). %s." % (plugin_name, e))
+                try:
+                    decoded[plugin_name] = yaml.load(plugin_data,
+                                                     Loader=_YLoader)
+                except Exception as e:
+                    logger.error("Couldn't load experiment log data for "
+                                 "plugin: %s. %s." % (plugin_name, e))
+                    decoded[plugin_name] = plugin_data
+            out.data[i] = decoded
         logger.debug("loaded in %f s.", time.time() - start_time)
         return out
 
@@ -232,23 +314,29 @@ class ExperimentLog():
             log_path = path(filename).parent
 
         if self.data:
-            out = deepcopy(self)
-            # serialize plugin dictionaries to strings
-            for i in range(len(out.data)):
-                for plugin_name, plugin_data in list(out.data[i].items()):
+            if format == 'pickle':
+                serialize = ft.partial(pickle.dumps,
+                                       protocol=pickle.HIGHEST_PROTOCOL)
+            elif format == 'yaml':
+                serialize = ft.partial(yaml.dump, Dumper=_YDumper)
+            else:
+                raise TypeError
+            # Serialize plugin dictionaries to strings.
+            #
+            # Temporarily swap in the serialized data rather than dumping a
+            # deep copy of the entire log.
+            data = self.data
+            self.data = [{plugin_name: serialize(plugin_data)
+                          for plugin_name, plugin_data in step.items()}
+                         for step in data]
+            try:
+                with open(filename, 'wb') as f:
                     if format == 'pickle':
-                        out.data[i][plugin_name] = pickle.dumps(plugin_data)
-                    elif format == 'yaml':
-                        out.data[i][plugin_name] = yaml.dump(plugin_data)
+                        pickle.dump(self, f, -1)
                     else:
-                        raise TypeError
-            with open(filename, 'wb') as f:
-                if format == 'pickle':
-                    pickle.dump(out, f, -1)
-                elif format == 'yaml':
-                    yaml.dump(out, f)
-                else:
-                    raise TypeError
+                        yaml.dump(self, f, Dumper=_YDumper)
+            finally:
+                self.data = data
         return log_path
 
     def start_time(self):
@@ -264,11 +352,13 @@ class ExperimentLog():
         return path(self.directory).joinpath(str(self.experiment_id))
 
     def add_step(self, step_number, attempt=0):
+        self._frame_cache = None
         self.data.append({'core': {'step': step_number,
                                    'time': (time.time() - self.start_time()),
                                    'attempt': attempt}})
 
     def add_data(self, data, plugin_name='core'):
+        self._frame_cache = None
         if not self.data:
             self.data.append({})
         if plugin_name not in self.data[-1]:
@@ -279,8 +369,9 @@ class ExperimentLog():
     def get(self, name, plugin_name='core'):
         var = []
         for d in self.data:
-            if plugin_name in d and list(d[plugin_name].keys()).count(name):
-                var.append(d[plugin_name][name])
+            plugin_data = d.get(plugin_name)
+            if plugin_data is not None and name in plugin_data:
+                var.append(plugin_data[name])
             else:
                 var.append(None)
         return var
@@ -300,8 +391,19 @@ class ExperimentLog():
                 Values may be Python objects.  In future versions
                 of MicroDrop, values *may* be restricted to json
                 compatible types.
+
+            .. note::
+                Result is cached until the log is modified through
+                :meth:`add_step` or :meth:`add_data`.  Copies are returned, so
+                callers may modify the result freely.
         '''
-        return log_data_to_frame(self)
+        cache_key = (id(self.data), len(self.data), self.uuid)
+        cached = getattr(self, '_frame_cache', None)
+        if cached is None or cached[0] != cache_key:
+            cached = (cache_key, log_data_to_frame(self))
+            self._frame_cache = cached
+        experiment_info, df_log = cached[1]
+        return experiment_info.copy(), df_log.copy()
 
     @property
     def empty(self):
@@ -315,7 +417,7 @@ class ExperimentLog():
 
         .. versionadded:: 2.32.3
         '''
-        if self.get_log_path().listdir():
+        if _dir_has_entries(self.get_log_path()):
             # Experiment log contains files and/or directories.
             return False
         elif [x for x in self.get('step') if x is not None]:
@@ -1,6 +1,9 @@
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+import copy
 import functools as ft
 import logging
+import os
+import stat
 import threading
 
 from microdrop_utility import Version
@@ -11,6 +14,7 @@ import yaml
 from .app_context import get_app
 from .plugin_manager import (IPlugin, ExtensionPoint, emit_signal,
                              get_service_instance_by_name)
+from .serialization import YamlSafeLoader as _YSafeLoader
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +34,31 @@ def from_dict(data):
 
 PluginMetaData.from_dict = staticmethod(from_dict)
 
+#: Parsed ``properties.yml`` metadata, keyed by file path.  Each value is a
+#: ``(st_mtime_ns, st_size, PluginMetaData)`` tuple.
+_PROPERTIES_CACHE = OrderedDict()
+_PROPERTIES_CACHE_MAXSIZE = 256
+
+_IPLUGIN_EXTENSION_POINT = None
+
+
+def _iplugin_extension_point():
+    '''
+    Returns
+    -------
+    pyutilib.component.core.ExtensionPoint
+        Shared ``IPlugin`` extension point.
+
+        .. note::
+            Services are resolved each time the extension point is queried, so
+            a single instance may safely be reused.
+    '''
+    global _IPLUGIN_EXTENSION_POINT
+
+    if _IPLUGIN_EXTENSION_POINT is None:
+        _IPLUGIN_EXTENSION_POINT = ExtensionPoint(IPlugin)
+    return _IPLUGIN_EXTENSION_POINT
+
 
 def get_plugin_info(plugin_root):
     '''
@@ -46,17 +75,66 @@ def get_plugin_info(plugin_root):
         Plugin metadata in the form ``(package_name, plugin_name, version)``.
 
         Returns ``None`` if plugin is not installed or is invalid.
+
+        .. note::
+            Parsed metadata is cached, keyed by ``properties.yml`` path,
+            modified time and size, i.e., the file is only re-parsed if it has
+            changed on disk.
     '''
     plugin_root = ph.path(plugin_root)
     properties = plugin_root.joinpath('properties.yml')
 
-    if not properties.isfile():
+    try:
+        st = os.stat(properties)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
         return None
+
+    key = str(properties)
+    cached = _PROPERTIES_CACHE.get(key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        _PROPERTIES_CACHE.move_to_end(key)
+        return cached[2]
+
+    properties_dict = yaml.load(properties.bytes(), Loader=_YSafeLoader)
+    plugin_metadata = PluginMetaData.from_dict(properties_dict)
+    _PROPERTIES_CACHE[key] = (st.st_mtime_ns, st.st_size, plugin_metadata)
+    _PROPERTIES_CACHE.move_to_end(key)
+    while len(_PROPERTIES_CACHE) > _PROPERTIES_CACHE_MAXSIZE:
+        _PROPERTIES_CACHE.popitem(last=False)
+    return plugin_metadata
+
+
+def _form_defaults(obj, cache_attr, form_class):
+    '''
+    Parameters
+    ----------
+    obj : object
+        Plugin instance to cache defaults on.
+    cache_attr : str
+        Name of instance attribute to cache defaults in.
+    form_class : flatland.Form
+        Form class to get default values from.
+
+    Returns
+    -------
+    dict
+        Copy of default values of :data:`form_class` fields.
+
+        Defaults are cached on :data:`obj`, keyed by the form class object, so
+        forms that are generated dynamically (e.g., by a ``StepFields``
+        property with defaults based on app options) are rebuilt whenever a
+        new form class is returned.
+    '''
+    cached = getattr(obj, cache_attr, None)
+    if cached is not None and cached[0] is form_class:
+        defaults = cached[1]
     else:
-        with properties.open('r') as f_properties:
-            properties_dict = yaml.load(f_properties)
-            plugin_metadata = PluginMetaData.from_dict(properties_dict)
-        return plugin_metadata
+        defaults = dict([(k, v.value)
+                         for k, v in form_class.from_defaults().items()])
+        setattr(obj, cache_attr, (form_class, defaults))
+    return copy.deepcopy(defaults)
 
 
 class AppDataController(object):
@@ -85,12 +163,10 @@ class AppDataController(object):
     ###########################################################################
     # Accessor methods
     def get_default_app_options(self):
-        if self.AppFields:
-            return dict([(k, v.value)
-                         for k, v in
-                         list(self.AppFields.from_defaults().items())])
-        else:
+        form_class = self.AppFields
+        if not form_class:
             return dict()
+        return _form_defaults(self, '_default_app_options_cache', form_class)
 
     def get_app_form_class(self):
         return self.AppFields
@@ -115,7 +191,7 @@ class AppDataController(object):
 
     @staticmethod
     def get_plugin_app_values(plugin_name):
-        observers = ExtensionPoint(IPlugin)
+        observers = _iplugin_extension_point()
         service = observers.service(plugin_name)
         if hasattr(service, 'get_app_values'):
             return service.get_app_values()
@@ -133,12 +209,13 @@ class AppDataController(object):
             return
         if not hasattr(self, 'name'):
             raise NotImplementedError
-        for k in list(values_dict.keys()):
-            if k not in list(self.AppFields.field_schema_mapping.keys()):
-                _L().info("Invalid key (%s) in configuration file section: "
-                          "[%s].", k, self.name)
-                # remove invalid key from config file
-                values_dict.pop(k)
+        valid_keys = self.AppFields.field_schema_mapping
+        invalid_keys = [k for k in values_dict if k not in valid_keys]
+        for k in invalid_keys:
+            _L().info("Invalid key (%s) in configuration file section: "
+                      "[%s].", k, self.name)
+            # remove invalid key from config file
+            values_dict.pop(k)
         elements = self.AppFields(value=values_dict)
         if not elements.validate():
             raise ValueError('Invalid values: %s' % elements.errors)
@@ -155,17 +232,17 @@ class AppDataController(object):
 class StepOptionsController(object):
     @staticmethod
     def get_plugin_step_values(plugin_name, step_number=None):
-        observers = ExtensionPoint(IPlugin)
+        observers = _iplugin_extension_point()
         service = observers.service(plugin_name)
         if hasattr(service, 'get_step_values'):
             return service.get_step_values(step_number)
         return None
 
     def get_default_step_options(self):
-        if self.get_step_form_class() is None:
+        form_class = self.get_step_form_class()
+        if form_class is None:
             return dict()
-        return dict([(k, v.value)
-                     for k, v in list(self.StepFields.from_defaults().items())])
+        return _form_defaults(self, '_default_step_options_cache', form_class)
 
     def get_step_form_class(self):
         return getattr(self, 'StepFields', None)
@@ -245,6 +322,27 @@ class StepOptionsController(object):
         return options
 
 
+_ZMQ_HUB_PLUGIN = None
+
+
+def _zmq_hub_plugin():
+    '''
+    Returns
+    -------
+    object
+        ``microdrop.zmq_hub_plugin`` service instance.
+
+        Service is looked up once and cached until the next failed hub call.
+    '''
+    global _ZMQ_HUB_PLUGIN
+
+    if _ZMQ_HUB_PLUGIN is None:
+        _ZMQ_HUB_PLUGIN = get_service_instance_by_name('microdrop'
+                                                       '.zmq_hub_plugin',
+                                                       env='microdrop')
+    return _ZMQ_HUB_PLUGIN
+
+
 def _hub_method(method_name, *args, **kwargs):
     '''
     Execute ZeroMQ plugin call through `zmq_hub_plugin` asyncio event loop.
@@ -255,8 +353,9 @@ def _hub_method(method_name, *args, **kwargs):
 
     .. versionadded:: 2.25
     '''
-    plugin = get_service_instance_by_name('microdrop.zmq_hub_plugin',
-                                          env='microdrop')
+    global _ZMQ_HUB_PLUGIN
+
+    plugin = _zmq_hub_plugin()
 
     done = threading.Event()
 
@@ -274,6 +373,8 @@ def _hub_method(method_name, *args, **kwargs):
     plugin.zmq_exec_task.started.loop.call_soon_threadsafe(task)
     done.wait()
     if isinstance(done.result, Exception):
+        # Force service to be looked up again on next call.
+        _ZMQ_HUB_PLUGIN = None
         raise done.result
     return done.result
 
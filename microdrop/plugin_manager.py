@@ -372,6 +372,56 @@ def get_observers(function, interface=IPlugin):
     return observers
 
 
+def _call_observers(observers, schedule, function, args, interface, logger):
+    '''
+    Call specified function on each observer in scheduled order.
+
+    Parameters
+    ----------
+    observers : dict
+        Mapping from service names to service instances (see
+        :func:`get_observers`).
+    schedule : list
+        List of observer service names in scheduled order (see
+        :func:`get_schedule`).
+    function : str
+        Name of function to call.
+    args : list
+        Function arguments.
+    interface : class
+        Plugin interface class.
+    logger : logging.Logger
+        Logger to report plugin errors to.
+
+    Returns
+    -------
+    dict
+        Mapping from each service name to the respective function return value.
+    '''
+    return_codes = {}
+    for observer_name in schedule:
+        observer = observers[observer_name]
+        try:
+            f = getattr(observer, function)
+            logger.debug('  call: %s.%s(...)', observer.name, function)
+            return_codes[observer.name] = f(*args)
+        except Exception as why:
+            with closing(StringIO()) as message:
+                if hasattr(observer, "name"):
+                    if interface == ILoggingPlugin:
+                        # If this is a logging plugin, do not try to log
+                        # since that will result in infinite recursion.
+                        # Instead, just continue onto the next plugin.
+                        continue
+                    print('%s plugin crashed processing %s signal.' % \
+                        (observer.name, function), file=message)
+                print('Reason:', str(why), file=message)
+                logger.error(message.getvalue().strip())
+            for line in traceback.format_exc().splitlines():
+                logger.info(line)
+    return return_codes
+
+
 def emit_signal(function, args=None, interface=IPlugin):
     '''
     Call specified function on each enabled plugin implementing the function
@@ -405,8 +455,6 @@ def emit_signal(function, args=None, interface=IPlugin):
         observers = get_observers(function, interface)
         schedule = get_schedule(observers, function)
 
-        return_codes = {}
-
         if args is None:
             args = []
         elif not isinstance(args, list):
@@ -416,32 +464,58 @@ def emit_signal(function, args=None, interface=IPlugin):
             logger.debug('caller: %s -> %s', caller, function)
             if logger.getEffectiveLevel() <= logging.DEBUG:
                 logger.debug('args: (%s)', ', '.join(map(repr, args)))
-        for observer_name in schedule:
-            observer = observers[observer_name]
-            try:
-                f = getattr(observer, function)
-                logger.debug('  call: %s.%s(...)', observer.name, function)
-                return_codes[observer.name] = f(*args)
-            except Exception as why:
-                with closing(StringIO()) as message:
-                    if hasattr(observer, "name"):
-                        if interface == ILoggingPlugin:
-                            # If this is a logging plugin, do not try to log
-                            # since that will result in infinite recursion.
-                            # Instead, just continue onto the next plugin.
-                            continue
-                        print('%s plugin crashed processing %s signal.' % \
-                            (observer.name, function), file=message)
-                    print('Reason:', str(why), file=message)
-                    logger.error(message.getvalue().strip())
-                for line in traceback.format_exc().splitlines():
-                    logger.info(line)
-        return return_codes
+        return _call_observers(observers, schedule, function, args, interface,
+                               logger)
     except Exception as why:
         logger.error(why, exc_info=True)
         return {}
 
 
+def emit_signals(function, args_list, interface=IPlugin):
+    '''
+    Emit specified signal once for each set of arguments.
+
+    Equivalent to calling :func:`emit_signal` for each item in
+    :data:`args_list`, but observers and their schedule are only resolved
+    once.
+
+    Parameters
+    ----------
+    function : str
+        Name of function to generate schedule for.
+    args_list : list
+        List of argument lists, one per signal.
+    interface : class, optional
+        Plugin interface class.
+
+    Returns
+    -------
+    list
+        List of return code dictionaries (see :func:`emit_signal`), one per
+        signal.
+    '''
+    logger = _L()  # use logger with function context
+    i = 0
+    caller = caller_name(skip=i)
+
+    while not caller or caller == 'microdrop.plugin_manager.emit_signals':
+        i += 1
+        caller = caller_name(skip=i)
+
+    try:
+        observers = get_observers(function, interface)
+        schedule = get_schedule(observers, function)
+
+        if not any((name in caller) for name in ('logger', 'emit_signal')):
+            logger.debug('caller: %s -> %s (x%d)', caller, function,
+                         len(args_list))
+        return [_call_observers(observers, schedule, function, args,
+                                interface, logger) for args in args_list]
+    except Exception as why:
+        logger.error(why, exc_info=True)
+        return []
+
+
 def enable(name, env='microdrop.managed'):
     '''
     Enable specified plugin.
@@ -1,6 +1,5 @@
-from collections import OrderedDict
 import copy
-from functools import reduce
+import functools as ft
 try:
     import pickle as pickle
 except ImportError:
@@ -17,18 +16,38 @@ import types
 
 from microdrop_utility import Version, FutureVersionError
 import jsonschema
+try:
+    # Optional: compile schemas to Python code for faster validation.
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+try:
+    # Optional: faster JSON parsing.
+    import orjson
+except ImportError:
+    orjson = None
 import pandas as pd
 import path_helpers as ph
 import yaml
 import zmq_plugin as zp
 import zmq_plugin.schema
 
-from .plugin_manager import emit_signal
+from .plugin_manager import emit_signal, emit_signals
+from .serialization import (YamlLoader as _YLoader, YamlDumper as _YDumper,
+                            load_pickle_or_yaml)
 from logging_helpers import _L, caller_name  #: .. versionadded:: 2.20
 
 
 logger = logging.getLogger(__name__)
 
+# Versions used by `Protocol._upgrade()`, constructed once.
+_VERSION_0_1 = Version(0, 1)
+_VERSION_0_2 = Version(0, 2)
+#: Parse version strings (e.g., from loaded protocols) once per unique string.
+_version_fromstring = ft.lru_cache(maxsize=128)(Version.fromstring)
+#: Compile plugin name patterns (see `plugin_name_lookup()`) once per pattern.
+_compile_re = ft.lru_cache(maxsize=1024)(re.compile)
+
 
 MESSAGE_SCHEMA = {
     'definitions':
@@ -64,9 +83,177 @@ PROTOCOL_SCHEMA = copy.deepcopy(MESSAGE_SCHEMA)
 PROTOCOL_SCHEMA['allOf'] = [{'$ref': '#/definitions/protocol'}]
 STEP_SCHEMA = copy.deepcopy(MESSAGE_SCHEMA)
 STEP_SCHEMA['allOf'] = [{'$ref': '#/definitions/step'}]
+#: Protocol schema *without* step item checks (see :func:`_validate_protocol`).
+PROTOCOL_HEADER_SCHEMA = copy.deepcopy(PROTOCOL_SCHEMA)
+PROTOCOL_HEADER_SCHEMA['definitions']['protocol']['properties']['steps'] = \
+    {'type': 'array'}
+
+
+class _CompiledValidator(object):
+    '''
+    Validator using schema compiled with `fastjsonschema`_.
+
+    Exposes the :meth:`is_valid` and :meth:`validate` methods of a
+    :class:`jsonschema.Draft4Validator`, and delegates any other attribute
+    access to a wrapped :class:`jsonschema.Draft4Validator`.
+
+    .. _`fastjsonschema`: https://horejsek.github.io/python-fastjsonschema/
+    '''
+    def __init__(self, schema):
+        self.validator = jsonschema.Draft4Validator(schema)
+        # Do **not** fill in default values in validated instances.
+        self._validate = fastjsonschema.compile(schema, use_default=False)
+
+    def is_valid(self, instance):
+        try:
+            self._validate(instance)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+
+    def validate(self, instance):
+        try:
+            self._validate(instance)
+        except fastjsonschema.JsonSchemaException as exception:
+            # Use `jsonschema` validator to raise detailed error.
+            self.validator.validate(instance)
+            raise jsonschema.ValidationError(str(exception))
+
+    def __getattr__(self, name):
+        return getattr(self.validator, name)
+
+
+def _validator(schema):
+    if fastjsonschema is None:
+        return jsonschema.Draft4Validator(schema)
+    return _CompiledValidator(schema)
+
+
+#: Validators are constructed once and reused for every validation.
+VALIDATORS = {'protocol': _validator(PROTOCOL_SCHEMA),
+              'protocol_header': _validator(PROTOCOL_HEADER_SCHEMA),
+              'step': _validator(STEP_SCHEMA)}
+
+
+def _validate(schema_name, instance):
+    '''
+    Parameters
+    ----------
+    schema_name : str
+        Key of validator in :data:`VALIDATORS` (e.g., ``'protocol'``).
+    instance : dict
+        Object to validate.
+
+    Raises
+    ------
+    jsonschema.ValidationError
+        If :data:`instance` is not valid.
+    '''
+    VALIDATORS[schema_name].validate(instance)
 
-VALIDATORS = {'protocol': jsonschema.Draft4Validator(PROTOCOL_SCHEMA),
-              'step': jsonschema.Draft4Validator(STEP_SCHEMA)}
+
+def _validate_protocol(protocol_dict):
+    '''
+    Validate protocol dictionary against :data:`PROTOCOL_SCHEMA`.
+
+    Top-level protocol fields are validated first, followed by each step using
+    the cached step validator directly, rather than resolving the step
+    ``$ref`` for every item of the ``steps`` array.
+
+    Parameters
+    ----------
+    protocol_dict : dict
+        Protocol dictionary to validate.
+
+    Raises
+    ------
+    jsonschema.ValidationError
+        If :data:`protocol_dict` is not valid.
+    '''
+    _validate('protocol_header', protocol_dict)
+    validate = VALIDATORS['step'].validate
+    for step_i in protocol_dict.get('steps', []):
+        validate(step_i)
+
+
+def _pandas_object_hook(obj, _hook=zp.schema.pandas_object_hook):
+    '''
+    JSON object hook to decode pandas objects.
+
+    Equivalent to :func:`zmq_plugin.schema.pandas_object_hook`, but only calls
+    it for dictionaries containing a ``type`` key (i.e., the key used to mark
+    encoded pandas objects); most decoded dictionaries are returned as-is.
+    '''
+    return _hook(obj) if 'type' in obj else obj
+
+
+def _apply_object_hook(obj, object_hook):
+    '''
+    Apply JSON object hook to each dictionary in a decoded JSON object.
+
+    Dictionaries are passed to :data:`object_hook` innermost first, i.e., in
+    the same order as the ``object_hook`` argument of :func:`json.loads`.
+
+    Parameters
+    ----------
+    obj : object
+        Decoded JSON object.
+    object_hook : function
+        Function called with each decoded dictionary; the return value is used
+        in place of the dictionary.
+
+    Returns
+    -------
+    object
+        Decoded JSON object with hook applied.
+    '''
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, (dict, list)):
+                obj[k] = _apply_object_hook(v, object_hook)
+        return object_hook(obj)
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            if isinstance(v, (dict, list)):
+                obj[i] = _apply_object_hook(v, object_hook)
+    return obj
+
+
+def _ndjson_loads(line, object_hook=_pandas_object_hook):
+    '''
+    Decode a single line of newline delimited JSON.
+
+    Uses `orjson`_ if available, falling back to :func:`json.loads`.
+
+    Parameters
+    ----------
+    line : str or bytes
+        JSON document.
+    object_hook : function, optional
+        JSON object hook (see :func:`json.loads`).
+
+    Returns
+    -------
+    object
+        Decoded JSON object.
+
+
+    .. _`orjson`: https://github.com/ijl/orjson
+    '''
+    if orjson is None:
+        return json.loads(line, object_hook=object_hook)
+    try:
+        obj = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        # `orjson` is strict about JSON, e.g., it does not accept the `NaN` and
+        # `Infinity` values written by :mod:`json`.
+        return json.loads(line, object_hook=object_hook)
+    # Pandas objects are encoded as JSON objects with a ``type`` key (see
+    # `zmq_plugin.schema.PandasJsonEncoder`), so only walk the decoded object
+    # if the line may contain one.
+    if (b'"type"' if isinstance(line, bytes) else '"type"') in line:
+        obj = _apply_object_hook(obj, object_hook)
+    return obj
 
 
 class SerializationError(Exception):
@@ -119,31 +306,45 @@ def serialize_protocol(protocol_dict, serialize_func):
         # Exception occurred.  Try to identify where exception occurred.
         logger = _L()  # use logger with function context
         logger.debug('Error serializing protocol.')
-        logger.debug('Search for steps causing exception')
-        # Try to serialize each step, and record which steps cause exceptions.
-        exception_steps = []
-        for i, step_i in enumerate(protocol_dict['steps']):
-            try:
-                serialize_func(step_i)
-            except Exception as exception:
-                exception_steps.append({'step': i, 'error': str(exception)})
         logger.debug('Search for plugin(s) causing exception')
-        # For each step causing an exception, try to independently serialize
-        # data for each plugin, recording which plugins cause exceptions.
+        # Independently serialize data for each plugin in each step (in a
+        # single pass), recording which plugins cause exceptions.
         exceptions = []
-        for exception_step_i in exception_steps:
-            step_i = protocol_dict['steps'][exception_step_i['step']]
-            for plugin_name_ij, plugin_data_ij in step_i.items():
-                try:
-                    serialize_func(plugin_data_ij)
-                except Exception as exception:
-                    exception_step_i.update({'error': str(exception),
-                                             'plugin': plugin_name_ij,
-                                             'data': plugin_data_ij})
-                    exceptions.append(exception_step_i)
+        for i, step_i in enumerate(protocol_dict['steps']):
+            exceptions.extend(_step_exceptions(i, step_i, serialize_func))
         raise SerializationError('Error serializing protocol.', exceptions)
 
 
+def _step_exceptions(step_number, step_data, serialize_func):
+    '''
+    Parameters
+    ----------
+    step_number : int
+        Step number.
+    step_data : dict
+        Step plugin data, keyed by plugin name.
+    serialize_func : function
+        Serialization function.
+
+    Returns
+    -------
+    list
+        List of objects corresponding to plugins that cause an exception
+        during serialization, in the form described in
+        :class:`SerializationError`.
+    '''
+    exceptions = []
+    for plugin_name_ij, plugin_data_ij in step_data.items():
+        try:
+            serialize_func(plugin_data_ij)
+        except Exception as exception:
+            exceptions.append({'step': step_number,
+                               'error': str(exception),
+                               'plugin': plugin_name_ij,
+                               'data': plugin_data_ij})
+    return exceptions
+
+
 def protocol_to_frame(protocol_i):
     '''
     Parameters
@@ -166,21 +367,42 @@ def protocol_to_frame(protocol_i):
              of MicroDrop, values *may* be restricted to json
              compatible types.
     '''
-    plugin_names_i = sorted(reduce(lambda a, b:
-                                   a.union(list(b.plugin_data.keys())),
-                                   protocol_i.steps, set()))
-    frames_i = OrderedDict()
-
-    for plugin_name_ij in plugin_names_i:
-        try:
-            frame_ij = pd.DataFrame(list(map(pickle.loads,
-                                        [s.plugin_data.get(plugin_name_ij)
-                                         for s in protocol_i.steps])))
-        except Exception as exception:
-            print(exception, file=sys.stderr)
-        else:
-            frames_i[plugin_name_ij] = frame_ij
-    df_protocol = pd.concat(list(frames_i.values()), axis=1, keys=list(frames_i.keys()))
+    _loads = pickle.loads
+    # Flatten protocol into `(step_i, plugin_name, step_field, value)` records
+    # in a single pass, unpickling each plugin value exactly once.
+    records = []
+    extend_records = records.extend
+    failed_plugins = set()
+    for step_i, step in enumerate(protocol_i.steps):
+        for plugin_name_ij, plugin_data_ij in step.plugin_data.items():
+            if plugin_name_ij in failed_plugins:
+                continue
+            try:
+                fields_ij = _loads(plugin_data_ij).items()
+            except Exception as exception:
+                print(exception, file=sys.stderr)
+                failed_plugins.add(plugin_name_ij)
+                continue
+            extend_records((step_i, plugin_name_ij, k, v)
+                           for k, v in fields_ij)
+    if failed_plugins:
+        records = [r for r in records if r[1] not in failed_plugins]
+
+    # Keep values in an `object` series while reshaping so that each step
+    # field column infers its own dtype afterwards (i.e., integer fields are
+    # not coerced to a common `float64` dtype with other fields).
+    if records:
+        step_ids, plugin_names, step_fields, values = zip(*records)
+    else:
+        step_ids, plugin_names, step_fields, values = [], [], [], []
+    index = pd.MultiIndex.from_arrays([step_ids, plugin_names, step_fields],
+                                      names=['step_i', 'plugin_name',
+                                             'step_field'])
+    df_protocol = (pd.Series(values, index=index, dtype=object)
+                   .unstack(['plugin_name', 'step_field'])
+                   .reindex(range(len(protocol_i.steps))).infer_objects()
+                   .sort_index(axis=1, level='plugin_name',
+                               sort_remaining=False))
     df_protocol.index.name = 'step_i'
     df_protocol.columns.names = ['plugin_name', 'step_field']
     return df_protocol
@@ -208,7 +430,7 @@ def safe_pickle_loads(data):
                    exception)
 
 
-def _plugin_data_to_dict(plugin_data, loaded=True):
+def _plugin_data_to_dict(plugin_data, loaded=True, to_dict_cache=None):
     '''
     Parameters
     ----------
@@ -219,6 +441,12 @@ def _plugin_data_to_dict(plugin_data, loaded=True):
         implication being that the plugin data will already be unpickled.
 
         If ``False``, plugin data will be unpickled.
+    to_dict_cache : dict, optional
+        Mapping from plugin data type to the corresponding ``to_dict`` method
+        (or ``None`` if the type has no ``to_dict`` method).
+
+        May be shared between calls (e.g., for all steps in a protocol) to
+        only look up ``to_dict`` once per type.
 
     Returns
     -------
@@ -226,44 +454,65 @@ def _plugin_data_to_dict(plugin_data, loaded=True):
         Dictionary containing JSON-safe plugin data, e.g., for a single
         protocol step.
     '''
+    if to_dict_cache is None:
+        to_dict_cache = {}
+    _loads = safe_pickle_loads
     result = {}
 
     for plugin_ij, plugin_data_ij in plugin_data.items():
         # Unpickle data if necessary.
         if not loaded:
-            plugin_data_ij = safe_pickle_loads(plugin_data_ij)
+            plugin_data_ij = _loads(plugin_data_ij)
         # Use `to_dict` class method to convert Python object to dictionary for
         # plugins where applicable.
-        if hasattr(plugin_data_ij, 'to_dict'):
-            plugin_data_ij = plugin_data_ij.to_dict()
+        type_ij = type(plugin_data_ij)
+        try:
+            to_dict = to_dict_cache[type_ij]
+        except KeyError:
+            to_dict = getattr(type_ij, 'to_dict', None)
+            to_dict_cache[type_ij] = to_dict
+        if to_dict is not None:
+            plugin_data_ij = to_dict(plugin_data_ij)
         result[plugin_ij] = plugin_data_ij
     return result
 
 
-def _plugin_data_from_dict(plugin_data_dict):
+def _plugin_data_from_dict(plugin_data_dict, from_dict_cache=None):
     '''
     Parameters
     ----------
     plugin_data : dict
         Dictionary containing JSON-safe plugin data, keyed by plugin name.
+    from_dict_cache : dict, optional
+        Mapping from fully-qualified class name to corresponding ``from_dict``
+        class method (or ``None`` if class has no ``from_dict`` method).
+
+        May be shared between calls (e.g., for all steps in a protocol) to
+        only import and look up each class once.
 
     Returns
     -------
     dict
         Dictionary containing Python plugin data.
     '''
+    if from_dict_cache is None:
+        from_dict_cache = {}
     result = {}
     for plugin_ij, plugin_data_ij in plugin_data_dict.items():
         # Use `from_dict` class method to reconstruct Python object for plugins
         # where applicable.
         if '__class__' in plugin_data_ij:
             class_str = plugin_data_ij.pop('__class__')
-            module_str = '.'.join(class_str.split('.')[:-1])
-            class_name_str = class_str.split('.')[-1]
-            module_ij = importlib.import_module(module_str)
-            class_ = getattr(module_ij, class_name_str)
-            if hasattr(class_, 'from_dict'):
-                plugin_data_ij = class_.from_dict(plugin_data_ij)
+            try:
+                from_dict = from_dict_cache[class_str]
+            except KeyError:
+                module_str, _, class_name_str = class_str.rpartition('.')
+                module_ij = importlib.import_module(module_str)
+                class_ = getattr(module_ij, class_name_str)
+                from_dict = getattr(class_, 'from_dict', None)
+                from_dict_cache[class_str] = from_dict
+            if from_dict is not None:
+                plugin_data_ij = from_dict(plugin_data_ij)
         result[plugin_ij] = plugin_data_ij
     return result
 
@@ -300,12 +549,18 @@ def protocol_to_dict(protocol, loaded=True):
            protocol step.
          - ``uuid, optional``: Universally unique identifier.
     '''
+    # Look up `to_dict` method once per plugin data type for the entire
+    # protocol, rather than once per plugin per step.
+    to_dict_cache = {}
+    steps = [_plugin_data_to_dict(step_i.plugin_data, loaded=loaded,
+                                  to_dict_cache=to_dict_cache)
+             for step_i in protocol.steps]
     protocol_dict = {'name': protocol.name,
                      'version': protocol.version,
-                     'steps': [_plugin_data_to_dict(step_i.plugin_data,
-                                                    loaded=loaded)
-                               for step_i in protocol.steps],
-                     'plugin_data': _plugin_data_to_dict(protocol.plugin_data)}
+                     'steps': steps,
+                     'plugin_data':
+                     _plugin_data_to_dict(protocol.plugin_data,
+                                          to_dict_cache=to_dict_cache)}
     return protocol_dict
 
 
@@ -335,22 +590,48 @@ def protocol_from_dict(protocol_dict):
     Protocol
         MicroDrop protocol.
     '''
+    return _protocol_from_dict(protocol_dict, copy_steps=True)
+
+
+def _protocol_from_dict(protocol_dict, copy_steps):
+    '''
+    See :func:`protocol_from_dict`.
+
+    Parameters
+    ----------
+    protocol_dict : dict
+        Protocol dictionary.
+    copy_steps : bool
+        If ``True``, copy step plugin data (see :class:`Step`).
+
+        If ``False``, step plugin data values are taken from
+        :data:`protocol_dict` directly (i.e., they are **not** copied), which
+        is only safe if :data:`protocol_dict` is not used elsewhere, e.g., if
+        it was just decoded from JSON.
+    '''
     try:
-        VALIDATORS['protocol'].validate(protocol_dict)
+        _validate_protocol(protocol_dict)
     except jsonschema.ValidationError:
-        logging.warning('Error validating protocol dictionary.', exc_info=True)
+        logger.warning('Error validating protocol dictionary.', exc_info=True)
         raise
     protocol = Protocol(name=protocol_dict['name'])
     assert(protocol.version == protocol_dict['version'])
 
+    # Resolve each plugin data class (and its `from_dict` method) once for the
+    # entire protocol, rather than once per step.
+    from_dict_cache = {}
+
     # Convert step dictionaries to Python `Step` instances.
-    protocol.steps = [Step(plugin_data=_plugin_data_from_dict(step_i))
+    step_type = Step if copy_steps else Step._from_plugin_data
+    protocol.steps = [step_type(_plugin_data_from_dict(step_i,
+                                                       from_dict_cache))
                       for step_i in protocol_dict['steps']]
 
     # Convert protocol level plugin data dictionary to Python objects where
     # applicable.
     protocol.plugin_data = _plugin_data_from_dict(protocol_dict
-                                                  .get('plugin_data'))
+                                                  .get('plugin_data'),
+                                                  from_dict_cache)
     return protocol
 
 
@@ -377,25 +658,24 @@ def protocol_to_json(protocol, validate=True, ostream=None, json_kwargs=None,
 
         See :func:`protocol_to_dict` for details on JSON object structure.
     '''
-    if ostream is None:
-        ostream = StringIO.StringIO()
-        return_required = True
-    else:
-        return_required = False
     protocol_dict = protocol_to_dict(protocol, **kwargs)
 
     if validate:
-        VALIDATORS['protocol'].validate(protocol_dict)
+        _validate_protocol(protocol_dict)
+
+    # Serialize to a string with `json.dumps` (rather than `json.dump` to a
+    # stream), which:
+    #  - avoids an intermediate `StringIO` buffer (and copy) when no output
+    #    stream is specified;
+    #  - uses the C encoder (`json.dump` always uses the pure Python
+    #    encoder);
+    #  - does not write partial output to the stream if an exception occurs.
+    encoder = zp.schema.PandasJsonEncoder(**(json_kwargs or {}))
+    json_str = serialize_protocol(protocol_dict, encoder.encode)
 
-    def serialize_func(obj):
-        return json.dump(obj=obj, fp=ostream,
-                         cls=zp.schema.PandasJsonEncoder,
-                         **(json_kwargs or {}))
-
-    serialize_protocol(protocol_dict, serialize_func)
-
-    if return_required:
-        return ostream.getvalue()
+    if ostream is None:
+        return json_str
+    ostream.write(json_str)
 
 
 def protocol_to_ndjson(protocol, ostream=None):
@@ -450,32 +730,29 @@ def protocol_to_ndjson(protocol, ostream=None):
 
     steps = protocol_dict.pop('steps')
 
-    def serialize_func(obj):
-        return json.dumps(obj, cls=zp.schema.PandasJsonEncoder)
-
-    # Write JSON header (does not include any step data).
-    print(serialize_func(protocol_dict), file=ostream)
-    # Write plugin data for each step to a separate line in the output
-    # stream.
+    # Reuse a single encoder instance for all steps, rather than constructing
+    # a new encoder for every `json.dumps(..., cls=...)` call.
+    serialize_func = zp.schema.PandasJsonEncoder().encode
     exceptions = []
-    for i, step_i in enumerate(steps):
-        try:
-            print(serialize_func(step_i), file=ostream)
-        except Exception as exception:
-            # Exception occurred while serializing step.
-            _L().debug('Error serializing step.')
-            # Try to independently serialize data for each plugin,
-            # recording which plugins cause exceptions.
-            _L().debug('Search for plugin(s) causing exception')
-            for plugin_name_ij, plugin_data_ij in step_i.items():
-                try:
-                    serialize_func(plugin_data_ij)
-                except Exception as exception:
-                    exception_step_i = {'step': i,
-                                        'error': str(exception),
-                                        'plugin': plugin_name_ij,
-                                        'data': plugin_data_ij}
-                    exceptions.append(exception_step_i)
+
+    def _lines():
+        # Write JSON header (does not include any step data).
+        yield serialize_func(protocol_dict) + '\n'
+        # Write plugin data for each step to a separate line in the output
+        # stream.
+        for i, step_i in enumerate(steps):
+            try:
+                yield serialize_func(step_i) + '\n'
+            except Exception as exception:
+                # Exception occurred while serializing step.
+                _L().debug('Error serializing step.')
+                # Try to independently serialize data for each plugin,
+                # recording which plugins cause exceptions.
+                _L().debug('Search for plugin(s) causing exception')
+                exceptions.extend(_step_exceptions(i, step_i,
+                                                   serialize_func))
+
+    ostream.writelines(_lines())
     if exceptions:
         raise SerializationError('Error serializing protocol.', exceptions)
     if return_required:
@@ -483,7 +760,8 @@ def protocol_to_ndjson(protocol, ostream=None):
 
 
 def _protocol_remove_exceptions(protocol, exceptions, step_getter,
-                                plugin_data_getter, inplace=False):
+                                plugin_data_getter, inplace=False,
+                                copy_func=None):
     '''
     Parameters
     ----------
@@ -504,6 +782,12 @@ def _protocol_remove_exceptions(protocol, exceptions, step_getter,
         Otherwise, return modified copy.
 
         Default is ``False``.
+    copy_func : function, optional
+        Function that takes a protocol object and a set of step numbers and
+        returns a copy of the protocol where (at least) the plugin data
+        dictionaries of the specified steps are copied.
+
+        If not specified, a deep copy of the protocol is made.
 
     Returns
     -------
@@ -515,7 +799,11 @@ def _protocol_remove_exceptions(protocol, exceptions, step_getter,
     :func:`protocol_remove_exceptions`, :func:`protocol_dict_remove_exceptions`
     '''
     if not inplace:
-        protocol = copy.deepcopy(protocol)
+        if copy_func is None:
+            protocol = copy.deepcopy(protocol)
+        else:
+            protocol = copy_func(protocol, {exception_i['step']
+                                            for exception_i in exceptions})
 
     # Delete plugin data that is causing serialization errors.
     for exception_i in exceptions:
@@ -548,6 +836,10 @@ def protocol_dict_remove_exceptions(protocol_dict, exceptions, inplace=False):
 
         Otherwise, return modified copy.
 
+        .. note::
+            Only the steps that are modified are copied, i.e., all other steps
+            are shared with :data:`protocol_dict`.
+
         Default is ``False``.
 
     Returns
@@ -559,13 +851,21 @@ def protocol_dict_remove_exceptions(protocol_dict, exceptions, inplace=False):
     --------
     :func:`protocol_dict_remove_exceptions`
     '''
+    def _copy_steps(protocol_dict, step_ids):
+        # Only copy step dictionaries that are to be modified.
+        protocol_dict = protocol_dict.copy()
+        protocol_dict['steps'] = [dict(step_i) if i in step_ids else step_i
+                                  for i, step_i in
+                                  enumerate(protocol_dict['steps'])]
+        return protocol_dict
+
     return _protocol_remove_exceptions(protocol_dict, exceptions,
                                        # Get step object from protocol.
                                        lambda protocol_i, step_i:
                                        protocol_i['steps'][step_i],
                                        # Get plugin data dict from step.
                                        lambda step_i: step_i,
-                                       inplace=inplace)
+                                       inplace=inplace, copy_func=_copy_steps)
 
 
 def protocol_remove_exceptions(protocol, exceptions, inplace=False):
@@ -582,6 +882,10 @@ def protocol_remove_exceptions(protocol, exceptions, inplace=False):
 
         Otherwise, return modified copy.
 
+        .. note::
+            Only the steps that are modified are copied, i.e., all other steps
+            are shared with :data:`protocol`.
+
         Default is ``False``.
 
     Returns
@@ -593,13 +897,26 @@ def protocol_remove_exceptions(protocol, exceptions, inplace=False):
     --------
     :func:`protocol_dict_remove_exceptions`
     '''
+    def _copy_steps(protocol, step_ids):
+        # Only copy steps (and their plugin data dictionaries) that are to be
+        # modified.
+        protocol = copy.copy(protocol)
+        steps = []
+        for i, step_i in enumerate(protocol.steps):
+            if i in step_ids:
+                step_i = copy.copy(step_i)
+                step_i.plugin_data = dict(step_i.plugin_data)
+            steps.append(step_i)
+        protocol.steps = steps
+        return protocol
+
     return _protocol_remove_exceptions(protocol, exceptions,
                                        # Get step object from protocol.
                                        lambda protocol_i, step_i:
                                        protocol_i.steps[step_i],
                                        # Get plugin data dict from step.
                                        lambda step_i: step_i.plugin_data,
-                                       inplace=inplace)
+                                       inplace=inplace, copy_func=_copy_steps)
 
 
 def protocol_dict_transform_plugin_data(protocol_dict, transform_func,
@@ -684,20 +1001,8 @@ class Protocol():
                 return cls.from_json(istream=input_)
 
         start_time = time.time()
-        out = None
-        with open(filename, 'rb') as f:
-            try:
-                out = pickle.load(f)
-                logger.debug("Loaded object from pickle.")
-            except Exception as e:
-                logger.debug("Not a valid pickle file. %s." % e)
-        if out is None:
-            with open(filename, 'rb') as f:
-                try:
-                    out = yaml.load(f)
-                    logger.debug("Loaded object from YAML file.")
-                except Exception as e:
-                    logger.debug("Not a valid YAML file. %s." % e)
+        with open(filename, 'rb', buffering=1 << 20) as f:
+            out = load_pickle_or_yaml(f)
         if out is None:
             raise TypeError
         out.filename = filename
@@ -714,6 +1019,8 @@ class Protocol():
             out.version = str(Version(0))
         out._upgrade()
 
+        _pickle_loads = pickle.loads
+
         def _decode(value):
             '''
             .. versionadded:: 2.11.1
@@ -730,7 +1037,7 @@ class Protocol():
                 Decoded object.
             '''
             try:
-                return pickle.loads(value)
+                return _pickle_loads(value)
             except Exception as e:
                 logger.debug('Error decoding: `%s`', value, exc_info=True)
                 if 'No module named indexes.base' in str(e):
@@ -754,22 +1061,26 @@ class Protocol():
                                       '.dmf_device_controller.',
                                       '!!python/object:microdrop.gui.'
                                       'dmf_device_controller.')
-                return yaml.load(value)
+                return yaml.load(value, Loader=_YLoader)
 
-        for k, v in list(out.plugin_data.items()):
+        # Decoded values are assigned to existing keys only, so it is safe to
+        # update each dictionary while iterating over it (i.e., no copy).
+        plugin_data = out.plugin_data
+        for k, v in plugin_data.items():
             try:
-                out.plugin_data[k] = _decode(v)
+                plugin_data[k] = _decode(v)
             except Exception as e:
                 logger.error('Error decoding plugin data for `%s`: `%s`', k, v,
                              exc_info=True)
 
-        for i in range(len(out)):
-            for k, v in list(out[i].plugin_data.items()):
+        for i, step in enumerate(out.steps):
+            plugin_data = step.plugin_data
+            for k, v in plugin_data.items():
                 try:
-                    out[i].plugin_data[k] = _decode(v)
+                    plugin_data[k] = _decode(v)
                 except Exception as e:
-                        logger.error('Error decoding plugin data for step %d, '
-                                     '`%s`: `%s`', i, k, v, exc_info=True)
+                    logger.error('Error decoding plugin data for step %d, '
+                                 '`%s`: `%s`', i, k, v, exc_info=True)
 
         logger.debug("[Protocol].load() loaded in %f s.",
                      time.time() - start_time)
@@ -779,23 +1090,30 @@ class Protocol():
         return protocol_remove_exceptions(self, exceptions, inplace=inplace)
 
     def save(self, filename, format='pickle'):
-        out = copy.deepcopy(self)
+        def _dumps(plugin_data):
+            return {k: pickle.dumps(v, pickle.HIGHEST_PROTOCOL)
+                    for k, v in plugin_data.items()}
+
+        # Shallow copy protocol and steps, replacing only the plugin data
+        # dictionaries (i.e., do not deep copy plugin data objects that are
+        # immediately converted to strings anyway).
+        out = copy.copy(self)
         if hasattr(out, 'filename'):
             del out.filename
 
         # convert plugin data objects to strings
-        for k, v in list(out.plugin_data.items()):
-            out.plugin_data[k] = pickle.dumps(v, -1)
-
-        for step in out.steps:
-            for k, v in list(step.plugin_data.items()):
-                step.plugin_data[k] = pickle.dumps(v, -1)
-
-        with open(filename, 'wb') as f:
+        out.plugin_data = _dumps(self.plugin_data)
+        out.steps = []
+        for step in self.steps:
+            step_out = copy.copy(step)
+            step_out.plugin_data = _dumps(step.plugin_data)
+            out.steps.append(step_out)
+
+        with open(filename, 'wb', buffering=1 << 20) as f:
             if format == 'pickle':
-                pickle.dump(out, f, -1)
+                pickle.dump(out, f, pickle.HIGHEST_PROTOCOL)
             elif format == 'yaml':
-                yaml.dump(out, f)
+                yaml.dump(out, f, Dumper=_YDumper)
             else:
                 raise TypeError
 
@@ -900,9 +1218,9 @@ class Protocol():
         else:
             # Read from `istream` as an input stream.
             load_func = json.load
-        protocol_dict = load_func(istream, object_hook=zp.schema
-                                  .pandas_object_hook)
-        return protocol_from_dict(protocol_dict)
+        protocol_dict = load_func(istream, object_hook=_pandas_object_hook)
+        # Protocol dictionary was just decoded, so no need to copy step data.
+        return _protocol_from_dict(protocol_dict, copy_steps=False)
 
     def to_ndjson(self, ostream=None, ignore_errors=False):
         '''
@@ -945,8 +1263,8 @@ class Protocol():
             if not ignore_errors:
                 raise
             else:
-                logging.warn('Skipping plugin data in steps where exceptions '
-                             'encountered during serialization.')
+                logger.warning('Skipping plugin data in steps where '
+                               'exceptions encountered during serialization.')
                 protocol_clean = self.remove_exceptions(exception.exceptions)
                 return protocol_to_ndjson(protocol_clean, ostream=ostream)
 
@@ -958,13 +1276,13 @@ class Protocol():
 
         Parameters
         ----------
-        istream : str or file-like
+        istream : str, bytes or file-like
             Input new-line delimited JSON to read protocol from.
 
             If file-like, read from as an input stream.
 
-            If a string, assume input is new-line delimited JSON serialized
-            protocol string.
+            If a string (or bytes), assume input is new-line delimited JSON
+            serialized protocol string.
 
         Returns
         -------
@@ -979,18 +1297,32 @@ class Protocol():
         .. _`ndjson`: http://ndjson.org/
         .. _`specification`: http://specs.frictionlessdata.io/ndjson/
         '''
-        if isinstance(istream, (str,)):
+        if isinstance(istream, (str, bytes)):
             # Assume input is new-line delimited JSON serialized protocol
             # string.
-            istream = StringIO.StringIO(istream)
-
-        def _loads(x):
-            return json.loads(x, object_hook=zp.schema.pandas_object_hook)
-
-        protocol_dict = _loads(istream.readline())
-        protocol_dict['steps'] = [_loads(line_i)
-                                  for line_i in istream.readlines()]
-        return protocol_from_dict(protocol_dict)
+            ndjson = istream
+        else:
+            ndjson = istream.read()
+        # Split into lines in a single pass.
+        #
+        # Note that `str.splitlines()` is **not** used since it also splits on
+        # Unicode line boundaries (e.g., `\u2028`), which may appear
+        # unescaped within JSON strings.
+        newline = b'\n' if isinstance(ndjson, bytes) else '\n'
+        header, _, body = ndjson.partition(newline)
+
+        _loads = _ndjson_loads
+        protocol_dict = _loads(header)
+        # Allocate step list with the number of lines up front (rather than
+        # growing it while appending).
+        body = body.rstrip(newline)
+        lines = body.split(newline) if body else []
+        steps = [None] * len(lines)
+        for i, line_i in enumerate(lines):
+            steps[i] = _loads(line_i)
+        protocol_dict['steps'] = steps
+        # Protocol dictionary was just decoded, so no need to copy step data.
+        return _protocol_from_dict(protocol_dict, copy_steps=False)
 
     def _upgrade(self):
         """
@@ -1001,24 +1333,25 @@ class Protocol():
                 software.
         """
         logger = _L()  # use logger with method context
-        version = Version.fromstring(self.version)
+        version = _version_fromstring(self.version)
+        class_version = _version_fromstring(self.class_version)
         logger.debug('version=%s, class_version=%s', str(version),
                      self.class_version)
-        if version > Version.fromstring(self.class_version):
+        if version > class_version:
             logger.debug('version > class_version')
-            raise FutureVersionError(Version.fromstring(self.class_version),
-                                     version)
-        elif version < Version.fromstring(self.class_version):
-            if version < Version(0, 1):
-                for k, v in list(self.plugin_data.items()):
-                    self.plugin_data[k] = yaml.dump(v)
+            raise FutureVersionError(class_version, version)
+        elif version < class_version:
+            if version < _VERSION_0_1:
+                _dump = ft.partial(yaml.dump, Dumper=_YDumper)
+                self.plugin_data = {k: _dump(v)
+                                    for k, v in self.plugin_data.items()}
                 for step in self.steps:
-                    for k, v in list(step.plugin_data.items()):
-                        step.plugin_data[k] = yaml.dump(v)
-                self.version = str(Version(0, 1))
+                    step.plugin_data = {k: _dump(v)
+                                        for k, v in step.plugin_data.items()}
+                self.version = str(_VERSION_0_1)
                 logger.debug('upgrade to version %s', self.version)
-            if version < Version(0, 2):
-                self.version = str(Version(0, 2))
+            if version < _VERSION_0_2:
+                self.version = str(_VERSION_0_2)
                 logger.debug('upgrade to version %s', self.version)
         # else the versions are equal and don't need to be upgraded
 
@@ -1027,14 +1360,19 @@ class Protocol():
     # ---------------------
     @property
     def plugins(self):
-        return set(self.plugin_data.keys())
+        '''
+        Names of plugins with data, as a (set-like) view of the plugin data
+        keys.
+        '''
+        return self.plugin_data.keys()
 
     def plugin_name_lookup(self, name, re_pattern=False):
         if not re_pattern:
             return name
 
-        for plugin_name in self.plugins:
-            if re.search(name, plugin_name):
+        search = _compile_re(name).search
+        for plugin_name in self.plugin_data:
+            if search(plugin_name):
                 return plugin_name
         return None
 
@@ -1042,7 +1380,9 @@ class Protocol():
     # Protocol-wide plugin data
     # -------------------------
     def get_data(self, plugin_name):
-        logging.debug('[Protocol] plugin_data=%s' % self.plugin_data)
+        # Pass data as argument so it is only formatted if debug logging is
+        # enabled.
+        logger.debug('[Protocol] plugin_data=%s', self.plugin_data)
         return self.plugin_data.get(plugin_name)
 
     def set_data(self, plugin_name, data):
@@ -1062,11 +1402,22 @@ class Protocol():
         if values is None and count is None:
             raise ValueError('Either count or values must be specified')
         elif values is None:
-            values = [Step()] * count
-        for value in values[::-1]:
-            self.insert_step(step_number, value, notify=False)
-        emit_signal('on_steps_inserted', args=list(range(step_number, step_number +
-                                                    len(values))))
+            # Create a distinct step for each position (i.e., not `count`
+            # references to a single shared step).
+            values = [Step() for i in range(count)]
+        else:
+            values = list(values)
+        if step_number is None:
+            from .app_context import get_app
+
+            app = get_app()
+            step_number = app.protocol_controller.protocol_state['step_number']
+        # Insert all steps with a single splice, rather than shifting the
+        # existing steps once per inserted step.
+        self.steps[step_number:step_number] = values
+        new_step_numbers = list(range(step_number, step_number + len(values)))
+        emit_signals('on_step_created', [[i] for i in new_step_numbers])
+        emit_signal('on_steps_inserted', args=new_step_numbers)
 
     def insert_step(self, step_number=None, value=None, notify=True):
         from .app_context import get_app
@@ -1082,32 +1433,64 @@ class Protocol():
             emit_signal('on_step_inserted', args=[step_number])
 
     def delete_step(self, step_number):
+        self.delete_steps([step_number])
+
+    def delete_steps(self, step_ids):
         from .app_context import get_app
 
+        drop_ids = frozenset(step_ids)
+        if not drop_ids:
+            return
+
         app = get_app()
-        step_to_remove = self.steps[step_number]
-        del self.steps[step_number]
-        emit_signal('on_step_removed', args=[step_number, step_to_remove])
+        steps = self.steps
+        removed = [(i, step_i) for i, step_i in enumerate(steps)
+                   if i in drop_ids]
+        # Remove all steps in a single pass (rather than shifting the
+        # remaining steps once per deleted step).
+        steps[:] = [step_i for i, step_i in enumerate(steps)
+                    if i not in drop_ids]
+        # Notify in reverse order, i.e., as if steps were deleted one at a
+        # time from the end, so each step number matches the protocol at the
+        # time of removal.
+        emit_signals('on_step_removed', [[step_number, step_to_remove]
+                                         for step_number, step_to_remove
+                                         in reversed(removed)])
 
         active_step_number = (app.protocol_controller
                               .protocol_state['step_number'])
-        if len(self.steps) == 0:
+        step_count = len(steps)
+        if step_count == 0:
             # If we deleted the last remaining step, we need to insert a new
             # default Step
             self.insert_step(0, Step())
             app.protocol_controller.goto_step(0)
-        elif len(self.steps) == active_step_number:
-            app.protocol_controller.goto_step(step_number - 1)
         else:
-            app.protocol_controller.goto_step(active_step_number)
+            app.protocol_controller.goto_step(min(active_step_number,
+                                                  step_count - 1))
 
-    def delete_steps(self, step_ids):
-        sorted_ids = sorted(step_ids)
-        # Process deletion of steps in reverse order to avoid ID mismatch due
-        # to deleted rows.
-        sorted_ids.reverse()
-        for id in sorted_ids:
-            self.delete_step(id)
+
+def _clone_plugin_data(plugin_data):
+    '''
+    Parameters
+    ----------
+    plugin_data : dict
+        Plugin data dictionary.
+
+    Returns
+    -------
+    dict
+        Deep copy of :data:`plugin_data`.
+
+        Copy is made using a :mod:`pickle` round-trip, which is typically much
+        faster than :func:`copy.deepcopy`.  Falls back to
+        :func:`copy.deepcopy` if the plugin data cannot be pickled.
+    '''
+    try:
+        return pickle.loads(pickle.dumps(plugin_data,
+                                         pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return copy.deepcopy(plugin_data)
 
 
 class Step(object):
@@ -1115,21 +1498,43 @@ class Step(object):
         if plugin_data is None:
             self.plugin_data = {}
         else:
-            self.plugin_data = copy.deepcopy(plugin_data)
+            self.plugin_data = _clone_plugin_data(plugin_data)
+
+    @classmethod
+    def _from_plugin_data(cls, plugin_data):
+        '''
+        Create step using :data:`plugin_data` directly, i.e., **without**
+        copying.
+
+        Parameters
+        ----------
+        plugin_data : dict
+            Plugin data dictionary, which **MUST NOT** be shared.
+        '''
+        step = cls.__new__(cls)
+        step.plugin_data = plugin_data
+        return step
 
     def copy(self):
-        return Step(plugin_data=copy.deepcopy(self.plugin_data))
+        # Clone the plugin data once (the constructor would otherwise copy the
+        # copy).
+        return Step._from_plugin_data(_clone_plugin_data(self.plugin_data))
 
     @property
     def plugins(self):
-        return set(self.plugin_data.keys())
+        '''
+        Names of plugins with data, as a (set-like) view of the plugin data
+        keys.
+        '''
+        return self.plugin_data.keys()
 
     def plugin_name_lookup(self, name, re_pattern=False):
         if not re_pattern:
             return name
 
-        for plugin_name in self.plugins:
-            if re.search(name, plugin_name):
+        search = _compile_re(name).search
+        for plugin_name in self.plugin_data:
+            if search(plugin_name):
                 return plugin_name
         return None
 
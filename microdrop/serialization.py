@@ -0,0 +1,67 @@
+'''
+Helpers shared by objects serialized as pickle or YAML files (e.g.,
+:class:`microdrop.protocol.Protocol`,
+:class:`microdrop.experiment_log.ExperimentLog`).
+'''
+import functools as ft
+import pickle
+
+from logging_helpers import _L
+import yaml
+try:
+    # Use libyaml C bindings where available (much faster than pure-Python).
+    from yaml import (CLoader as YamlLoader, CSafeLoader as YamlSafeLoader,
+                      CDumper as YamlDumper)
+except ImportError:
+    from yaml import (Loader as YamlLoader, SafeLoader as YamlSafeLoader,
+                      Dumper as YamlDumper)
+
+
+#: Leading bytes of pickle files.
+#:
+#: Pickles written with protocol 2+ start with the ``PROTO`` opcode
+#: (``\x80``); protocol 0/1 pickles (e.g., written by Python 2) typically
+#: start with a mark, an empty container, or a global.
+PICKLE_HEADERS = (b'\x80', b'(', b'}', b']', b'ccopy_reg')
+
+
+def load_pickle_or_yaml(f, pickle_load=pickle.load,
+                        yaml_load=ft.partial(yaml.load, Loader=YamlLoader)):
+    '''
+    Load object from a file in either pickle or YAML format.
+
+    The format indicated by the file header is tried first, falling back to
+    the other format in case the sniff is wrong.
+
+    Parameters
+    ----------
+    f : io.BufferedReader
+        File opened in binary mode (must support ``peek()`` and ``seek()``).
+    pickle_load : function, optional
+        Function to load object from pickle file.
+    yaml_load : function, optional
+        Function to load object from YAML file.
+
+    Returns
+    -------
+    object
+        Loaded object, or ``None`` if file could not be loaded in either
+        format.
+    '''
+    logger = _L()  # use logger with function context
+    pickle_loader = ('pickle', pickle_load)
+    yaml_loader = ('YAML', yaml_load)
+    if f.peek(16)[:16].startswith(PICKLE_HEADERS):
+        loaders = (pickle_loader, yaml_loader)
+    else:
+        loaders = (yaml_loader, pickle_loader)
+    for format_name, load in loaders:
+        f.seek(0)
+        try:
+            out = load(f)
+        except Exception as e:
+            logger.debug("Not a valid %s file. %s.", format_name, e)
+            continue
+        logger.debug("Loaded object from %s file.", format_name)
+        return out
+    return None
@@ -1,7 +1,12 @@
+import pickle
+import shutil
+import tempfile
+
+import pandas as pd
 from path_helpers import path
-from nose.tools import raises
+from nose.tools import eq_, raises
 
-from experiment_log import ExperimentLog
+from microdrop.experiment_log import ExperimentLog
 from microdrop_utility import Version
 
 def test_load_experiment_log():
@@ -34,3 +39,105 @@ def test_load_non_existant_experiment_log():
     ExperimentLog.load(path(__file__).parent /
                        path('experiment_logs') /
                        path('no log'))
+
+
+def test_next_experiment_id():
+    """
+    test experiment id is based on highest numbered log directory
+    """
+    # Each case: (sub-directories, names of non-empty sub-directories,
+    # expected experiment id).
+    cases = [([], [], 0),
+             (['0'], [], 0),
+             (['0'], ['0'], 1),
+             (['0', '1', 'notes'], ['0'], 1),
+             (['0', '2', 'notes'], ['2'], 3),
+             (['3', '10', 'notes', '\u00b2'], ['3', 'notes', '\u00b2'], 10)]
+    for dir_names, nonempty_names, expected_id in cases:
+        yield next_experiment_id, dir_names, nonempty_names, expected_id
+
+
+def next_experiment_id(dir_names, nonempty_names, expected_id):
+    root = path(tempfile.mkdtemp(prefix='microdrop-test-'))
+    try:
+        for name_i in dir_names:
+            root.joinpath(name_i).makedirs_p()
+        for name_i in nonempty_names:
+            root.joinpath(name_i, 'data').write_bytes(b'')
+        eq_(ExperimentLog(root).experiment_id, expected_id)
+    finally:
+        shutil.rmtree(root)
+
+
+def _pickled_log(steps):
+    log = ExperimentLog()
+    log.uuid = 'test-uuid'
+    log.data = [{plugin_name: pickle.dumps(data)
+                 for plugin_name, data in step.items()} for step in steps]
+    return log
+
+
+TEST_STEPS = [{'core': {'start time': 1500000000., 'step': 0, 'time': 0.,
+                        'attempt': 0, 'software version': '2.0'},
+               'a': {'x': 1}},
+              {'core': {'step': 1, 'time': 1.5, 'attempt': 0},
+               'b': {'y': 'z'}}]
+
+
+def test_log_data_to_frame():
+    """
+    test experiment log data frame contents
+    """
+    experiment_info, df_log = _pickled_log(TEST_STEPS).to_frame()
+    eq_(experiment_info.to_dict(),
+        {'software version': '2.0', 'utc_start_time': '2017-07-14T02:40:00',
+         'uuid': 'test-uuid'})
+    eq_(list(df_log.columns),
+        [('a', 'x'), ('b', 'y'), ('core', 'attempt'),
+         ('core', 'software version'), ('core', 'start time'),
+         ('core', 'step'), ('core', 'time'), ('core', 'utc_timestamp')])
+    eq_(list(df_log.index), [0, 1])
+    eq_(df_log[('a', 'x')].iloc[0], 1)
+    assert pd.isnull(df_log[('a', 'x')].iloc[1])
+    assert pd.isnull(df_log[('b', 'y')].iloc[0])
+    eq_(df_log[('b', 'y')].iloc[1], 'z')
+    eq_(list(df_log[('core', 'step')]), [0, 1])
+    eq_(list(df_log[('core', 'utc_timestamp')]),
+        [pd.Timestamp('2017-07-14 02:40:00'),
+         pd.Timestamp('2017-07-14 02:40:01.5')])
+
+
+def test_to_frame_cache():
+    """
+    test cached experiment log data frame is copied and invalidated
+    """
+    log = _pickled_log(TEST_STEPS)
+    df_log = log.to_frame()[1]
+    assert log._frame_cache is not None
+    # Modifying returned frame must not modify cached frame.
+    df_log.loc[0, ('a', 'x')] = 100
+    eq_(log.to_frame()[1].loc[0, ('a', 'x')], 1)
+    # Adding steps must invalidate cached frame.
+    log.data.append({'core': pickle.dumps({'step': 2, 'time': 3.,
+                                           'attempt': 0})})
+    eq_(list(log.to_frame()[1][('core', 'step')]), [0, 1, 2])
+    log.add_data({'x': 2}, plugin_name='c')
+    assert log._frame_cache is None
+
+    log = ExperimentLog()
+    log._frame_cache = ('stale', None)
+    log.add_step(0)
+    assert log._frame_cache is None
+
+
+def test_experiment_log_getstate():
+    """
+    test cached experiment log data frame is not pickled
+    """
+    log = _pickled_log(TEST_STEPS)
+    log.to_frame()
+    assert '_frame_cache' not in log.__getstate__()
+    assert '_frame_cache' in log.__dict__
+    log_copy = pickle.loads(pickle.dumps(log))
+    assert not hasattr(log_copy, '_frame_cache')
+    eq_(list(log_copy.to_frame()[1][('core', 'step')]), [0, 1])
@@ -1,7 +1,13 @@
+import io
+import json
+import pickle
+
+import pandas as pd
 from path_helpers import path
-from nose.tools import raises
+from nose.tools import eq_, raises
 
-from protocol import Protocol
+from microdrop.protocol import (Protocol, SerializationError, Step,
+                                protocol_to_frame, serialize_protocol)
 from microdrop_utility import Version
 
 def test_load_protocol():
@@ -35,3 +41,76 @@ def test_load_non_existant_protocol():
     Protocol.load(path(__file__).parent /
                    path('protocols') /
                    path('no protocol'))
+
+
+def test_insert_steps_count():
+    """
+    test inserting steps by count creates distinct step objects
+    """
+    protocol = Protocol(name='test')
+    protocol.insert_steps(step_number=1, count=3)
+    eq_(len(protocol), 4)
+    new_steps = protocol.steps[1:]
+    eq_(len(set(map(id, new_steps))), 3)
+    new_steps[0].set_data('test_plugin', {'value': 1})
+    assert all(step.get_data('test_plugin') is None
+               for step in new_steps[1:])
+
+
+def test_serialize_protocol_exceptions():
+    """
+    test one exception is reported per plugin that fails to serialize
+    """
+    protocol_dict = {'name': 'test', 'version': '0.2.0',
+                     'steps': [{'good': {'value': 1}},
+                               {'good': {'value': 2}, 'bad': object(),
+                                'bad2': object()}]}
+    try:
+        serialize_protocol(protocol_dict, json.dumps)
+    except SerializationError as exception:
+        eq_(sorted((e['step'], e['plugin']) for e in exception.exceptions),
+            [(1, 'bad'), (1, 'bad2')])
+    else:
+        raise AssertionError('`SerializationError` not raised.')
+
+
+def _ndjson_protocol():
+    protocol = Protocol(name='test')
+    protocol.steps = [Step({'test_plugin': {'value': i}}) for i in range(3)]
+    return protocol
+
+
+def test_from_ndjson():
+    """
+    test reading protocol from ndjson string, bytes, stream, and CRLF input
+    """
+    ndjson = _ndjson_protocol().to_ndjson()
+    yield from_ndjson, ndjson
+    yield from_ndjson, ndjson.encode('utf8')
+    yield from_ndjson, io.StringIO(ndjson)
+    yield from_ndjson, ndjson.replace('\n', '\r\n')
+
+
+def from_ndjson(istream):
+    protocol = Protocol.from_ndjson(istream)
+    expected = _ndjson_protocol()
+    eq_(protocol.name, expected.name)
+    eq_([step.plugin_data for step in protocol.steps],
+        [step.plugin_data for step in expected.steps])
+
+
+def test_protocol_to_frame_dtypes():
+    """
+    test step field columns keep their own dtypes for mixed int/float data
+    """
+    core_data = [{'duration': 100, 'voltage': 90.5},
+                 {'duration': 200, 'voltage': 91.}]
+    protocol = Protocol(name='test')
+    protocol.steps = [Step({'core': pickle.dumps(data_i)})
+                      for data_i in core_data]
+    df_protocol = protocol_to_frame(protocol)
+    # Dtypes should match a frame built from the step data directly.
+    expected_dtypes = pd.DataFrame(core_data).dtypes
+    for field_i, dtype_i in expected_dtypes.items():
+        eq_(df_protocol['core'][field_i].dtype, dtype_i)
+    eq_(df_protocol['core']['duration'].dtype.kind, 'i')
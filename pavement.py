@@ -1,7 +1,12 @@
 import os
-import pkg_resources
 import platform
+import re
 import sys
+try:
+    from importlib.metadata import version as _pkg_version
+except ImportError:
+    # Backport for Python < 3.8.
+    from importlib_metadata import version as _pkg_version
 
 from paver.easy import task, needs, path
 from paver.setuputils import setup
@@ -40,6 +45,10 @@ else:
         print(("Please install Python bindings for cairo using "
                               "your system's package manager."), file=sys.stderr)
 
+# Distribution names of `install_requires` (i.e., without version specifiers).
+install_names = [re.split(r'[<>=!~;\[\s]', p, maxsplit=1)[0]
+                 for p in install_requires]
+
 
 setup(name='microdrop',
       version=versioneer.get_version(),
@@ -61,12 +70,10 @@ setup(name='microdrop',
 
 @task
 def create_requirements():
-    package_list = [p.split('==')[0] for p in install_requires]
     requirements_path = os.path.join('microdrop', 'requirements.txt')
     with open(requirements_path, 'w') as output:
-        output.write('\n'.join(['%s==%s' %
-                                (p, pkg_resources.get_distribution(p).version)
-                                for p in package_list]))
+        output.write('\n'.join(['%s==%s' % (p, _pkg_version(p))
+                                for p in install_names]))
 
 
 @task